@@ -52,24 +52,96 @@ type_visualizers['QPixmap'] = show_pixmap
 value_to_webview_map = dict()
 previous_list_sizes = dict()  # Track previous list sizes
 
-def value_to_dict(value):
-    try:
-        unwrapped = value.unwrap(value)
-        children_count = unwrapped.GetNumChildren()
+object_vis_max_nodes = 5000  # nodes sent to the webview before the traversal is truncated
+object_vis_max_bytes = 1 << 20  # same as above, for the total size of the node names and values
+object_vis_cache = dict()  # (address, type name, stop id) -> (node, node count, byte count, keys, keys start, keys end) of fully traversed subtrees
+object_vis_cache_stop_id = None
+webview_roots = dict()  # webview name -> SBValue displayed in it (object_vis / list_vis), used to expand truncated nodes
+
+def get_node_string(sbvalue):
+    """Formats a single node without its children, so that each node is only formatted once"""
+    value = sbvalue.GetValue()
+    summary = sbvalue.GetSummary()
+    if value and summary:
+        return f"{value} {summary}"
+    if value or summary:
+        return value or summary
+    return '{...}' if sbvalue.MightHaveChildren() else ''
+
+def get_node_key(sbvalue, stop_id):
+    address = sbvalue.GetLoadAddress()
+    if address == lldb.LLDB_INVALID_ADDRESS:
+        return None
+    return (address, sbvalue.GetType().GetName(), stop_id)
+
+def new_traversal_budget():
+    # 'keys' lists the keys added to `seen` in order, so the keys of a subtree are a slice of it
+    return {'nodes': object_vis_max_nodes, 'bytes': object_vis_max_bytes, 'truncations': 0, 'shared': 0, 'keys': []}
+
+def sbvalue_to_dict(sbvalue, budget, seen, stop_id):
+    """Converts sbvalue and its children to nested dicts, stopping when `budget` runs out.
+    `seen` holds the keys of the nodes already emitted in this traversal"""
+    global object_vis_cache, object_vis_cache_stop_id
+
+    if object_vis_cache_stop_id != stop_id:
+        object_vis_cache = dict()
+        object_vis_cache_stop_id = stop_id
+
+    name = sbvalue.GetName()
+    key = get_node_key(sbvalue, stop_id)
 
-        name = unwrapped.GetName()
-        string_repr = str(value)
+    if key is not None and key not in seen:
+        cached = object_vis_cache.get(key)
+        if cached is not None and cached[1] <= budget['nodes'] and cached[2] <= budget['bytes']:
+            node, node_count, byte_count, keys, keys_start, keys_end = cached
+            subtree_keys = keys[keys_start:keys_end]
+            # a cached subtree can only be reused if none of its nodes is already shown in this traversal
+            if seen.isdisjoint(subtree_keys):
+                budget['nodes'] -= node_count
+                budget['bytes'] -= byte_count
+                seen.update(subtree_keys)
+                budget['keys'].extend(subtree_keys)
+                return dict(node, name=name)
 
-        resp = dict()
-        resp['name'] = name
-        resp['string_repr'] = string_repr
-        resp['children'] = []
+    nodes_before, bytes_before = budget['nodes'], budget['bytes']
+    truncations_before, shared_before, keys_before = budget['truncations'], budget['shared'], len(budget['keys'])
+    string_repr = get_node_string(sbvalue)
+    budget['nodes'] -= 1
+    budget['bytes'] -= len(string_repr) + len(name or '')
 
-        for i in range(children_count):
-            child = unwrapped.GetChildAtIndex(i)
-            child_wrapped = type(value)(child)
-            resp['children'].append(value_to_dict(child_wrapped))
-        return resp
+    resp = dict()
+    resp['name'] = name
+    resp['string_repr'] = string_repr
+    resp['children'] = []
+
+    if key is not None:
+        if key in seen:
+            # shared subobject (or a cycle), it is already expanded somewhere else
+            resp['string_repr'] = f"{string_repr} (shared)"
+            budget['shared'] += 1
+            return resp
+        seen.add(key)
+        budget['keys'].append(key)
+
+    children_count = sbvalue.GetNumChildren()
+    for i in range(children_count):
+        if budget['nodes'] <= 0 or budget['bytes'] <= 0:
+            resp['truncated'] = True
+            resp['string_repr'] = f"{string_repr} (showing {i} of {children_count} children)"
+            budget['truncations'] += 1
+            break
+        resp['children'].append(sbvalue_to_dict(sbvalue.GetChildAtIndex(i), budget, seen, stop_id))
+
+    # subtrees with truncated nodes or "(shared)" stubs depend on this traversal and are not cached
+    if key is not None and budget['truncations'] == truncations_before and budget['shared'] == shared_before:
+        object_vis_cache[key] = (resp, nodes_before - budget['nodes'], bytes_before - budget['bytes'], budget['keys'], keys_before, len(budget['keys']))
+    return resp
+
+def value_to_dict(value):
+    try:
+        unwrapped = value.unwrap(value)
+        stop_id = unwrapped.GetProcess().GetStopID()
+        return sbvalue_to_dict(unwrapped, new_traversal_budget(), set(), stop_id)
     except Exception as e:
         return str(e)
 
@@ -180,6 +252,14 @@ def get_constant_html_template():
                 min-width: 150px;
                 flex: 1;
             }
+            .note {
+                color: #888;
+            }
+            .expand-button {
+                font-family: monospace;
+                font-size: 11px;
+                cursor: pointer;
+            }
             .filter-label {
                 font-size: 12px;
                 color: #666;
@@ -193,6 +273,7 @@ def get_constant_html_template():
         var previousData = {};
         var previousListSizes = {};
         var filterSettings = {};  // store per‐table filter selections
+        var vscode = acquireVsCodeApi();
         
         function buildHtmlFromData(data, path = "") {
             if (typeof data === 'string') {
@@ -211,6 +292,12 @@ def get_constant_html_template():
             var nodeId = ('node_' + path + '_' + name).replace(/[ .]/g, '_');
             
             var html = '<div class="node" data-path="' + path + '" data-value="' + stringRepr + '"><strong>' + name + '</strong>: <span class="value-span">' + stringRepr + '</span>';
+            if (data.note) {
+                html += ' <span class="note">(' + data.note + ')</span>';
+            }
+            if (data.truncated) {
+                html += ' <button class="expand-button" onclick="requestExpand(\\'' + path + '\\')">load more</button>';
+            }
             
             if (tableData) {
                 // --- Filter controls for this table ---
@@ -235,9 +322,10 @@ def get_constant_html_template():
                 // Data rows
                 for (var i = 0; i < tableData.rows.length; i++) {
                     var row = tableData.rows[i];
-                    html += '<tr data-path="' + path + '_' + i + '"><td>' + i + '</td>';
+                    var rowIndex = tableData.indices ? tableData.indices[i] : i;
+                    html += '<tr data-path="' + path + '_' + rowIndex + '"><td>' + rowIndex + '</td>';
                     for (var j = 0; j < row.length; j++) {
-                        html += '<td data-path="' + path + '_' + i + '_' + j + '">' + row[j] + '</td>';
+                        html += '<td data-path="' + path + '_' + rowIndex + '_' + j + '">' + row[j] + '</td>';
                     }
                     html += '</tr>';
                 }
@@ -251,7 +339,7 @@ def get_constant_html_template():
                 html += '<summary>(' + children.length + ')</summary>';
                 html += '<div class="children">';
                 for (var i = 0; i < children.length; i++) {
-                    html += buildHtmlFromData(children[i], path + '_' + i);
+                    html += buildHtmlFromData(children[i], path + '_' + (data.indices ? data.indices[i] : i));
                 }
                 html += '</div></details>';
             }
@@ -363,7 +451,7 @@ def get_constant_html_template():
                 
                 var children = currentData.children || [];
                 for (var i = 0; i < children.length; i++) {
-                    traverse(children[i], currentPath + '_' + i);
+                    traverse(children[i], currentPath + '_' + (currentData.indices ? currentData.indices[i] : i));
                 }
             }
             
@@ -472,12 +560,36 @@ def get_constant_html_template():
             }
         }
         
+        // Ask the debugger for the full subtree of a truncated node
+        function requestExpand(path) {
+            var indices = path.split('_').filter(function(part) { return part !== ''; }).map(Number);
+            vscode.postMessage(JSON.stringify({ type: 'expand', path: path, indices: indices }));
+        }
+        
+        function expandNode(path, data) {
+            var element = document.querySelector('.node[data-path="' + path + '"]');
+            if (!element) return;
+            element.outerHTML = buildHtmlFromData(data, path);
+            restoreState();
+            attachToggleListeners();
+            var details = document.querySelector('.node[data-path="' + path + '"] > details');
+            if (details) details.open = true;
+        }
+        
         // Listen for messages from the debugger
         window.addEventListener('message', function(event) {
             var message = event.data;
             var message = JSON.parse(message);
             if (message.type === 'updateData') {
                 updateContent(message.data, message.storageKey);
+            } else if (message.type === 'expandData') {
+                expandNode(message.path, message.data);
+            } else if (message.type === 'expandError') {
+                var button = document.querySelector('.node[data-path="' + message.path + '"] > .expand-button');
+                if (button) {
+                    button.disabled = true;
+                    button.textContent = message.error;
+                }
             }
         });
         </script>
@@ -488,12 +600,49 @@ def get_constant_html_template():
     </html>
     """
 
+def on_webview_message(val_name, message):
+    """Handles the requests of an object_vis / list_vis webview to load more of a truncated node"""
+    import json
+
+    if isinstance(message, str):
+        message = json.loads(message)
+    if message.get('type') != 'expand':
+        return
+
+    try:
+        if val_name not in webview_roots:
+            raise RuntimeError(f"{val_name} is no longer displayed")
+        sbvalue = webview_roots[val_name]
+        for index in message['indices']:
+            if not sbvalue.IsValid() or index >= sbvalue.GetNumChildren():
+                raise RuntimeError("the value changed since it was displayed, refresh the view")
+            sbvalue = sbvalue.GetChildAtIndex(index)
+        if not sbvalue.IsValid():
+            raise RuntimeError("the value changed since it was displayed, refresh the view")
+
+        # the expanded node gets a fresh budget, its own children may still be truncated (and show "load more" again)
+        stop_id = sbvalue.GetProcess().GetStopID()
+        reply = {
+            'type': 'expandData',
+            'path': message['path'],
+            'data': sbvalue_to_dict(sbvalue, new_traversal_budget(), set(), stop_id),
+            'storageKey': f'detailsState_{val_name}'
+        }
+    except Exception as e:
+        reply = {
+            'type': 'expandError',
+            'path': message.get('path', ''),
+            'error': str(e),
+        }
+    value_to_webview_map[val_name].post_message(json.dumps(reply))
+
 def object_vis(value):
     import json
     
     global value_to_webview_map
     dbg_value = value_to_dict(value)
     val_name = value.unwrap(value).GetName()
+    webview_roots[val_name] = value.unwrap(value)
     
     if val_name in value_to_webview_map:
         webview = value_to_webview_map[val_name]
@@ -506,6 +655,7 @@ def object_vis(value):
     else:
         webview = debugger.create_webview(get_constant_html_template(), view_column=2, enable_scripts=True)
         value_to_webview_map[val_name] = webview
+        webview.on_did_receive_message.add(lambda message, val_name=val_name: on_webview_message(val_name, message))
         
         message = {
             'type': 'updateData',
@@ -514,7 +664,8 @@ def object_vis(value):
         }
         webview.post_message(json.dumps(message))
 
-    return str(value)
+    # str(value) would format the whole object again
+    return dbg_value['string_repr'] if isinstance(dbg_value, dict) else dbg_value
 
 def get_string_from_value(target, result):
     result_type = result.GetType().GetCanonicalType().GetName()
@@ -540,6 +691,149 @@ def get_string_from_value(target, result):
             
     return result_str
 
+string_column_max_length = 256  # max characters fetched for each string cell
+string_column_read_gap = 4096  # string reads closer than this are merged into one ReadMemory call
+string_column_max_read = 1 << 20  # upper bound for the size of a merged read
+
+def get_string_column_layout(process, element_type):
+    """Returns the memory layout name of a std::string / QString type, or None for other types.
+    The decoders assume a 64-bit little-endian target"""
+    if process.GetAddressByteSize() != 8 or process.GetByteOrder() != lldb.eByteOrderLittle:
+        return None
+
+    canonical_type = element_type.GetCanonicalType()
+    type_name = canonical_type.GetName()
+    byte_size = canonical_type.GetByteSize()
+
+    if type_name == 'QString':
+        if byte_size == 8:
+            return 'qt5'
+        if byte_size == 24:
+            return 'qt6'
+    elif type_name.startswith('std::__cxx11::basic_string<char,') and byte_size == 32:
+        return 'libstdc++'
+    elif type_name.startswith('std::__1::basic_string<char,') and byte_size == 24:
+        return 'libc++'
+    return None
+
+def read_memory_coalesced(process, ranges):
+    """Reads a list of (address, length) ranges with as few ReadMemory calls as possible.
+    Returns the bytes of each range (None if the range could not be read)"""
+    results = [None] * len(ranges)
+    order = sorted((i for i in range(len(ranges)) if ranges[i][0] and ranges[i][1] > 0), key=lambda i: ranges[i][0])
+
+    for i, (address, length) in enumerate(ranges):
+        if length == 0:
+            results[i] = b''
+
+    begin = 0
+    while begin < len(order):
+        start = ranges[order[begin]][0]
+        end = start + ranges[order[begin]][1]
+        stop = begin + 1
+        while stop < len(order):
+            address, length = ranges[order[stop]]
+            if address - end > string_column_read_gap or max(end, address + length) - start > string_column_max_read:
+                break
+            end = max(end, address + length)
+            stop += 1
+
+        error = lldb.SBError()
+        chunk = process.ReadMemory(start, end - start, error)
+        for i in order[begin:stop]:
+            address, length = ranges[i]
+            if error.Success():
+                results[i] = chunk[address - start:address - start + length]
+            else:
+                # one bad pointer shouldn't hide the whole batch, retry the ranges one by one
+                single_error = lldb.SBError()
+                data = process.ReadMemory(address, length, single_error)
+                results[i] = data if single_error.Success() else None
+        begin = stop
+
+    return results
+
+def get_string_column_values(process, layout, start_address, element_size, count, indices=None, raw=False):
+    """Decodes the strings at `indices` (default: all) of the `count` consecutive strings stored
+    at `start_address` using bulk memory reads instead of going through the LLDB summary formatter
+    for each element. The result is aligned with `indices`.
+    Strings are quoted and truncated for display, unless `raw` is set (used for exports)"""
+    import struct
+
+    selected = range(count) if indices is None else indices
+    if count <= 0 or len(selected) == 0:
+        return []
+
+    # only the selected elements are read, e.g. the top rows of a sorted column
+    elements = read_memory_coalesced(process, [(start_address + i * element_size, element_size) for i in selected])
+
+    max_length = float('inf') if raw else string_column_max_length
+    char_size = 2 if layout in ('qt5', 'qt6') else 1
+    # for each selected element: full length, data stored inside the result buffer (if any) and the (address, length) to read
+    lengths = [0] * len(selected)
+    inline_data = [None] * len(selected)
+    ranges = [(0, 0)] * len(selected)
+    failed = [element is None for element in elements]
+
+    if layout == 'qt5':
+        # QString is a single pointer to a QArrayData header: {int ref; int size; uint alloc; qptrdiff offset;}
+        header_addresses = [0 if element is None else struct.unpack_from('<Q', element)[0] for element in elements]
+        headers = read_memory_coalesced(process, [(address, 24) for address in header_addresses])
+        for k, header in enumerate(headers):
+            if header is None:
+                failed[k] = True
+                continue
+            size = struct.unpack_from('<i', header, 4)[0]
+            offset = struct.unpack_from('<q', header, 16)[0]
+            lengths[k] = max(size, 0)
+            ranges[k] = (header_addresses[k] + offset, min(lengths[k], max_length) * char_size)
+    else:
+        for k, i in enumerate(selected):
+            element = elements[k]
+            if element is None:
+                continue
+            if layout == 'libc++':
+                # the lowest bit of the first byte is the "long string" flag
+                first_byte = element[0]
+                if first_byte & 1:
+                    size, data_address = struct.unpack_from('<QQ', element, 8)
+                    lengths[k] = size
+                    ranges[k] = (data_address, min(size, max_length))
+                else:
+                    size = first_byte >> 1
+                    lengths[k] = size
+                    inline_data[k] = element[1:1 + min(size, max_length)]
+            elif layout == 'libstdc++':
+                data_address, size = struct.unpack_from('<QQ', element)
+                lengths[k] = size
+                local_buffer = start_address + i * element_size + 16
+                if data_address == local_buffer:
+                    inline_data[k] = element[16:16 + min(size, max_length)]
+                else:
+                    ranges[k] = (data_address, min(size, max_length))
+            elif layout == 'qt6':
+                # QArrayDataPointer<char16_t>: {Data *d; char16_t *ptr; qsizetype size;}
+                data_address, size = struct.unpack_from('<Qq', element, 8)
+                lengths[k] = max(size, 0)
+                ranges[k] = (data_address, min(lengths[k], max_length) * char_size)
+
+    character_data = read_memory_coalesced(process, ranges)
+
+    string_list = []
+    encoding = 'utf-16-le' if char_size == 2 else 'utf-8'
+    for k in range(len(selected)):
+        data = inline_data[k] if inline_data[k] is not None else character_data[k]
+        if failed[k] or data is None:
+            string_list.append('<error: unable to read string data>')
+            continue
+        text = data.decode(encoding, errors='replace')
+        if raw:
+            string_list.append(text)
+            continue
+        suffix = '...' if lengths[k] > max_length else ''
+        string_list.append(f'"{text}{suffix}"')
+    return string_list
+
 cached_compiled_expressions = []
 
 # def get_list_expression_evaluator(frame, container_expr, expr):
@@ -601,28 +895,77 @@ cached_compiled_expressions = []
 
 count = 0
 
-def get_expression_string_values_for_list(target, frame, value, expression):
+def get_numpy_dtype(element_type):
+    """Returns the numpy dtype matching a scalar LLDB type, or None if the type can't be decoded directly"""
+    import numpy as np
+
+    canonical_type = element_type.GetCanonicalType()
+    type_flags = canonical_type.GetTypeFlags()
+    byte_size = canonical_type.GetByteSize()
+
+    if not (type_flags & lldb.eTypeIsScalar) or (type_flags & lldb.eTypeIsPointer):
+        return None
+    if type_flags & lldb.eTypeIsFloat:
+        return np.dtype(f'<f{byte_size}') if byte_size in (4, 8) else None
+    if byte_size not in (1, 2, 4, 8):
+        return None
+    kind = 'i' if type_flags & lldb.eTypeIsSigned else 'u'
+    return np.dtype(f'<{kind}{byte_size}')
+
+def is_arithmetic_type(element_type):
+    type_flags = element_type.GetCanonicalType().GetTypeFlags()
+    return bool(type_flags & lldb.eTypeIsScalar) and not (type_flags & lldb.eTypeIsPointer)
+
+def free_result_buffer(frame, opts, element_type, start_address, size):
+    """Destroys the results constructed by the injected loop and frees their buffer"""
+    canonical_type = element_type.GetCanonicalType()
+    if canonical_type.GetTypeClass() in (lldb.eTypeClassClass, lldb.eTypeClassStruct, lldb.eTypeClassUnion):
+        destroy_cxx = f"""
+        typedef {canonical_type.GetName()} destroyed_t;
+        destroyed_t* res = (destroyed_t*){start_address};
+        for (size_t i = 0; i < {size}; ++i) {{
+            res[i].~destroyed_t();
+        }}
+        """
+        frame.EvaluateExpression(destroy_cxx, opts)
+    frame.EvaluateExpression(f"(void)free((void*){start_address});", opts)
+
+def get_expression_values_for_list(target, frame, variable_name, expression, indices=None, typed_only=False, start=0, length=None, raw_strings=False, list_size=None, fallback=True):
+    """Evaluates `expression` for every element of the container named `variable_name`
+    (or only for the `length` elements starting at `start`, indices are then relative to `start`).
+    Returns (string_list, typed_values). Only the elements at `indices` (default: all) are
+    formatted as strings, the other entries of string_list are None.
+    With `typed_only`, numeric expressions are returned as a numpy array in typed_values and are
+    not formatted at all (string_list is None). Otherwise typed_values is always None.
+    With `raw_strings`, std::string / QString values are returned in full and without quotes.
+    `list_size` avoids evaluating the container size again when the caller already knows it.
+    If the batched evaluation fails, each element is evaluated on its own unless `fallback` is False,
+    in which case the error is raised."""
     global count
     count += 1
-    container_size = frame.EvaluateExpression(f"{value.unwrap(value).GetName()}.size()").GetValueAsSigned()
+    if list_size is None:
+        list_size = frame.EvaluateExpression(f"{variable_name}.size()").GetValueAsSigned()
+    container_size = list_size - start
+    if length is not None:
+        container_size = min(container_size, length)
+    container_size = max(container_size, 0)
+
+    if container_size == 0:
+        return [], None
 
     try:
+        # results are constructed in place (the buffer is uninitialized memory) and destroyed before freeing
         cxx = f"""
-        auto& c = {value.unwrap(value).GetName()};
-        auto& data_ptr = c.__begin_;
-        auto temp = {expression.replace('$', 'data_ptr[0]')};
+        auto& c = {variable_name};
+        auto temp = {expression.replace('$', f'c[{start}]')};
         using T_{count} = decltype(temp);
-        // static char buffer_{count}[sizeof(T_{count}) * 1000];
-        // char* buffer_{count} = new char[sizeof(T_{count}) * 1000];
-        char* buffer_{count} = (char*)malloc(sizeof(T_{count}) * 1000);
+        size_t size_{count} = {container_size};
+        char* buffer_{count} = (char*)malloc(sizeof(T_{count}) * size_{count});
         T_{count}* res_{count} = (T_{count}*)((void*)&buffer_{count}[0]);
-        // T_{count}* res_{count} = new T_{count}[1000];
 
-        int max_iter_{count} = c.size() < 1000 ? c.size() : 1000;
-        for (int i = 0; i < max_iter_{count}; ++i) {{
-            res_{count}[i] = {expression.replace('$', 'data_ptr[i]')};
+        for (size_t i = 0; i < size_{count}; ++i) {{
+            new (&res_{count}[i]) T_{count}({expression.replace('$', f'c[{start} + i]')});
         }}
-        //(T_{count}*)&res_{count}[0];
         &res_{count}[0];
         """
 
@@ -631,38 +974,120 @@ def get_expression_string_values_for_list(target, frame, value, expression):
         opts.SetUnwindOnError(True)
         opts.SetIgnoreBreakpoints(True)
 
-        evaluated = frame.EvaluateExpression(cxx)
+        evaluated = frame.EvaluateExpression(cxx, opts)
+        if not evaluated.GetError().Success():
+            raise RuntimeError("Failed to evaluate expression: " + str(evaluated.GetError().GetCString()))
 
         ptr_type = evaluated.GetType()
         element_type = ptr_type.GetPointeeType()
         element_size = element_type.GetByteSize()
         start_address = evaluated.GetValueAsUnsigned()
-        ptr_val = evaluated.GetValue()
-        # print('ptr val:', ptr_val)
-
-        string_list = []
-        for i in range(container_size):
-            address = start_address + i * element_size
-            element_sbvalue = target.CreateValueFromAddress(f"var_{count}_{i}", lldb.SBAddress(address, target), element_type)
-            element_string = get_string_from_value(target, element_sbvalue)
-            string_list.append(element_string)
-        
-        element_type_name = element_type.GetName()
-        delete_cxx = f"(void)free((void*){start_address});"
-        delete_result = frame.EvaluateExpression(delete_cxx, opts)
-        # if not delete_result.error.Success():
-        #     print("Failed to delete buffer:", delete_result.error.GetCString())
 
-        return string_list
+        try:
+            typed_values = None
+            dtype = get_numpy_dtype(element_type) if typed_only else None
+            if typed_only and dtype is None and is_arithmetic_type(element_type):
+                # formatting these would silently turn them into strings (and sort "10" before "9")
+                raise RuntimeError(f"'{expression}' has type {element_type.GetName()}, which can't be read as numbers")
+            if dtype is not None:
+                import numpy as np
+                error = lldb.SBError()
+                memory = target.GetProcess().ReadMemory(start_address, element_size * container_size, error)
+                if not error.Success():
+                    raise RuntimeError(f"Failed to read the values of '{expression}': " + str(error.GetCString()))
+                typed_values = np.frombuffer(memory, dtype=dtype).copy()
+
+            if typed_values is not None:
+                string_list = None
+            else:
+                selected = range(container_size) if indices is None else indices
+                string_layout = get_string_column_layout(target.GetProcess(), element_type)
+                if string_layout is not None:
+                    # strings are decoded in bulk, going through the summary formatter for each one is too slow
+                    selected_strings = get_string_column_values(target.GetProcess(), string_layout, start_address, element_size, container_size, selected, raw_strings)
+                else:
+                    selected_strings = []
+                    for i in selected:
+                        address = start_address + i * element_size
+                        element_sbvalue = target.CreateValueFromAddress(f"var_{count}_{i}", lldb.SBAddress(address, target), element_type)
+                        element_string = get_string_from_value(target, element_sbvalue)
+                        selected_strings.append(element_string)
+
+                if indices is None:
+                    string_list = selected_strings
+                else:
+                    string_list = [None] * container_size
+                    for i, element_string in zip(indices, selected_strings):
+                        string_list[i] = element_string
+        finally:
+            free_result_buffer(frame, opts, element_type, start_address, container_size)
+
+        return string_list, typed_values
     except Exception as e:
-        res = []
-        for i in range(container_size):
-            ith_value = target.EvaluateExpression(f"{expression.replace('$', f'{value.unwrap(value).GetName()}[{i}]')}")
+        if not fallback:
+            raise
+        res = [None] * container_size
+        for i in (range(container_size) if indices is None else indices):
+            ith_value = frame.EvaluateExpression(f"{expression.replace('$', f'{variable_name}[{start + i}]')}")
             ith_string = get_string_from_value(target, ith_value)
-            res.append(ith_string)
-        return res
+            res[i] = ith_string
+        return res, None
+
+def parse_order_by(order_by):
+    """Splits an order_by argument into (expression, descending). A leading '-' means descending order"""
+    if order_by.startswith('-'):
+        return order_by[1:], True
+    return order_by, False
+
+def select_row_indices(size, keys=None, typed_keys=None, descending=False, limit=None):
+    """Returns the indices of the rows to display: sorted by the given keys (if any) and
+    truncated to `limit` rows. Numeric keys use argpartition so only the top-k rows are sorted"""
+    import numpy as np
+
+    if limit is None or limit > size:
+        limit = size
+    limit = max(limit, 0)
+
+    if typed_keys is None and keys is None:
+        return list(range(limit))
+
+    if typed_keys is not None:
+        # NaNs are placed last in both orders
+        if typed_keys.dtype.kind == 'f':
+            nan_mask = np.isnan(typed_keys)
+            valid, nan_indices = np.flatnonzero(~nan_mask), np.flatnonzero(nan_mask)
+        else:
+            valid, nan_indices = np.arange(size), np.arange(0)
+        valid_keys = typed_keys[valid]
+        valid_count = len(valid)
+        valid_limit = min(limit, valid_count)
 
-def list_vis(value, *expressions):
+        if 0 < valid_limit < valid_count:
+            # the k-th key splits the rows, ties at the boundary are taken in container order
+            if descending:
+                threshold = np.partition(valid_keys, valid_count - valid_limit)[valid_count - valid_limit]
+                better = np.flatnonzero(valid_keys > threshold)
+            else:
+                threshold = np.partition(valid_keys, valid_limit - 1)[valid_limit - 1]
+                better = np.flatnonzero(valid_keys < threshold)
+            ties = np.flatnonzero(valid_keys == threshold)[:valid_limit - len(better)]
+            candidates = np.sort(np.concatenate((better, ties)))
+        else:
+            candidates = np.arange(valid_limit)
+        # stable sort on the (small) candidate set, ties keep the container order
+        if descending:
+            candidates = candidates[::-1]
+            order = candidates[np.argsort(valid_keys[candidates], kind='stable')[::-1]]
+        else:
+            order = candidates[np.argsort(valid_keys[candidates], kind='stable')]
+        return valid[order].tolist() + nan_indices[:limit - valid_limit].tolist()
+
+    import heapq
+    if descending:
+        return heapq.nlargest(limit, range(size), key=lambda i: keys[i])
+    return heapq.nsmallest(limit, range(size), key=lambda i: keys[i])
+
+def list_vis(value, *expressions, order_by=None, limit=None):
     try:
         import json
         
@@ -683,45 +1108,66 @@ def list_vis(value, *expressions):
         if storage_key not in previous_list_sizes:
             previous_list_sizes[storage_key] = {}
         
-        
+        # Sorting and top-k selection happen here, only the selected rows are formatted and sent to the webview
+        string_repr = f"size={list_size}"
+        selection_note = None
+        indices = None
+        if order_by is not None or limit is not None:
+            keys, typed_keys, descending = None, None, False
+            if order_by is not None:
+                order_expr, descending = parse_order_by(order_by)
+                # no per-element fallback: it would only give display strings, which don't sort like the values
+                keys, typed_keys = get_expression_values_for_list(target, frame, variable_name, order_expr, typed_only=True, raw_strings=True, fallback=False)
+            indices = select_row_indices(list_size, keys, typed_keys, descending, limit)
+            selection_note = f"showing {len(indices)}"
+            if order_by is not None:
+                selection_note += f" ordered by {order_by}"
+
+        # Bulk evaluate each expression for the selected elements
+        expr_values = []
+        for expr in expressions:
+            vals, _ = get_expression_values_for_list(target, frame, variable_name, expr, indices)
+            # if error returned as string, replicate it for each index
+            expr_values.append(vals if isinstance(vals, list) else [str(vals)] * list_size)
+
+        if indices is None:
+            indices = range(list_size)
+
         list_data = {
             'name': variable_name,
-            'string_repr': f"size={list_size}",
+            'string_repr': string_repr,
             'children': []
         }
+        if selection_note is not None:
+            # children are identified by their container index so re-sorting doesn't flash them
+            list_data['note'] = selection_note
+            list_data['indices'] = list(indices)
         
         # If multiple expressions, use table format
         if len(expressions) > 1:
             table_data = {
                 'headers': expressions,
+                'indices': list(indices),
                 'rows': []
             }
-            # Bulk evaluate each expression for all elements
-            expr_values = []
-            for expr in expressions:
-                vals = get_expression_string_values_for_list(target, frame, value, expr)
-                # if error returned as string, replicate it for each index
-                expr_values.append(vals if isinstance(vals, list) else [str(vals)] * list_size)
             # Transpose into rows
-            for i in range(list_size):
+            for i in indices:
                 row = [expr_values[j][i] for j in range(len(expressions))]
                 table_data['rows'].append(row)
             list_data['table_data'] = table_data
         else:
             # Single expression or no expression - use faster bulk eval if one expression
             if expressions:
-                # Bulk evaluate single expression
-                vals = get_expression_string_values_for_list(target, frame, value, expressions[0])
-                for i, result_str in enumerate(vals if isinstance(vals, list) else [str(vals)] * list_size):
+                for i in indices:
                     child_data = {
                         'name': f"[{i}]",
-                        'string_repr': result_str,
+                        'string_repr': expr_values[0][i],
                         'children': []
                     }
                     list_data['children'].append(child_data)
             else:
                 # No expression: fallback to existing per-element dict conversion
-                for i in range(list_size):
+                for i in indices:
                     item = frame.EvaluateExpression(f"{variable_name}[{i}]")
                     item_wrapped = type(value)(item)
                     child_data = value_to_dict(item_wrapped)
@@ -735,6 +1181,8 @@ def list_vis(value, *expressions):
                         }
                     list_data['children'].append(child_data)
         
+        # children of list_data are the container's children, "load more" on them walks from here
+        webview_roots[variable_name] = unwrapped
         if variable_name in value_to_webview_map:
             webview = value_to_webview_map[variable_name]
             message = {
@@ -746,6 +1194,7 @@ def list_vis(value, *expressions):
         else:
             webview = debugger.create_webview(get_constant_html_template(), view_column=2, enable_scripts=True)
             value_to_webview_map[variable_name] = webview
+            webview.on_did_receive_message.add(lambda message, variable_name=variable_name: on_webview_message(variable_name, message))
             
             message = {
                 'type': 'updateData',
@@ -755,7 +1204,281 @@ def list_vis(value, *expressions):
             webview.post_message(json.dumps(message))
 
         expression_info = f" with {len(expressions)} expressions" if expressions else ""
+        if order_by is not None:
+            expression_info += f", ordered by {order_by}"
+        if limit is not None:
+            expression_info += f", limited to {limit} rows"
         return f"List visualization created (size: {list_size}){expression_info}"
     finally:
         target = lldb.debugger.GetSelectedTarget()
         target.Clear()
+
+export_chunk_size = 1 << 20  # number of elements evaluated at once by list_export
+
+def list_export(value, path, *expressions, chunk_size=None):
+    """Evaluates `expressions` for every element of `value` and streams the rows to `path`.
+    The format is chosen from the extension: .csv, .npy (numeric columns only) or .parquet (requires pyarrow)"""
+    import os
+    import csv
+    import numpy as np
+
+    if not expressions:
+        raise ValueError("list_export needs at least one expression, e.g. \"$\"")
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in ('.csv', '.npy', '.parquet'):
+        raise ValueError(f"Unsupported export format '{extension}', expected .csv, .npy or .parquet")
+    if extension == '.parquet':
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow")
+
+    chunk_size = export_chunk_size if chunk_size is None else chunk_size
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    start_time = time.time()
+
+    target = lldb.debugger.GetSelectedTarget()
+    process = target.GetProcess()
+    thread = process.GetSelectedThread()
+    frame = thread.GetSelectedFrame()
+
+    variable_name = value.unwrap(value).GetName()
+    list_size = frame.EvaluateExpression(f"{variable_name}.size()").GetValueAsUnsigned()
+    if list_size == 0:
+        return f"{variable_name} is empty, nothing was exported"
+
+    csv_file = None
+    csv_writer = None
+    npy_array = None
+    parquet_writer = None
+    column_kinds = None  # whether each column is numeric, decided by the first chunk
+    try:
+        for chunk_start in range(0, list_size, chunk_size):
+            # numeric columns are kept as typed arrays, everything else is formatted as strings.
+            # Failures are raised, evaluating a whole chunk element by element would take far too long
+            columns = []
+            for expr in expressions:
+                vals, typed_vals = get_expression_values_for_list(target, frame, variable_name, expr, typed_only=True, start=chunk_start, length=chunk_size, raw_strings=True, list_size=list_size, fallback=False)
+                columns.append(typed_vals if typed_vals is not None else vals)
+            chunk_kinds = [isinstance(column, np.ndarray) for column in columns]
+            if column_kinds is None:
+                column_kinds = chunk_kinds
+            elif chunk_kinds != column_kinds:
+                changed = [expr for expr, kind, chunk_kind in zip(expressions, column_kinds, chunk_kinds) if kind != chunk_kind]
+                raise RuntimeError(f"Failed to read {', '.join(changed)} as numbers for the elements starting at {chunk_start}, the export is incomplete")
+            chunk_length = len(columns[0])
+            indices = np.arange(chunk_start, chunk_start + chunk_length, dtype=np.uint64)
+
+            if extension == '.csv':
+                if csv_writer is None:
+                    csv_file = open(path, 'w', newline='')
+                    csv_writer = csv.writer(csv_file)
+                    csv_writer.writerow(['index', *expressions])
+                column_lists = [column.tolist() if isinstance(column, np.ndarray) else column for column in columns]
+                csv_writer.writerows(zip(indices.tolist(), *column_lists))
+            elif extension == '.npy':
+                if npy_array is None:
+                    for expr, column in zip(expressions, columns):
+                        if not isinstance(column, np.ndarray):
+                            raise ValueError(f"'{expr}' is not numeric, .npy export only supports numeric columns")
+                    if len(expressions) == 1:
+                        dtype = columns[0].dtype
+                    else:
+                        dtype = np.dtype([(expr, column.dtype) for expr, column in zip(expressions, columns)])
+                    # memory mapped so the full table never has to fit in memory
+                    npy_array = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(list_size,))
+                if len(expressions) == 1:
+                    npy_array[chunk_start:chunk_start + chunk_length] = columns[0]
+                else:
+                    for expr, column in zip(expressions, columns):
+                        npy_array[expr][chunk_start:chunk_start + chunk_length] = column
+                npy_array.flush()
+            else:
+                arrays = [pyarrow.array(indices)] + [pyarrow.array(column) for column in columns]
+                batch = pyarrow.RecordBatch.from_arrays(arrays, names=['index', *expressions])
+                if parquet_writer is None:
+                    parquet_writer = pyarrow.parquet.ParquetWriter(path, batch.schema)
+                parquet_writer.write_batch(batch)
+    finally:
+        if csv_file is not None:
+            csv_file.close()
+        if npy_array is not None:
+            del npy_array
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+    elapsed = time.time() - start_time
+    rows_per_second = list_size / elapsed if elapsed > 0 else float('inf')
+    return f"Exported {list_size} rows x {len(expressions)} columns to {path} in {elapsed:.2f}s ({rows_per_second:.0f} rows/s)"
+
+list_traces = dict()  # breakpoint id -> trace collected by list_trace
+list_trace_max_errors = 100  # error messages kept per trace, the others are only counted
+list_trace_max_failures = 20  # a trace stops after this many consecutive failed hits
+list_trace_plot_size = 1000  # max hits / elements per heatmap axis, larger traces are downsampled
+
+def list_trace(location, variable_name, *expressions, max_hits=None):
+    """Sets a breakpoint at `location` ("file:line" or a function name) that evaluates `expressions`
+    for each element of `variable_name` every time it is hit and continues without stopping.
+    The collected series is rendered by list_trace_vis, or automatically after `max_hits` hits"""
+    target = lldb.debugger.GetSelectedTarget()
+
+    file_name, _, line = location.rpartition(':')
+    if file_name and line.isdigit():
+        breakpoint = target.BreakpointCreateByLocation(file_name, int(line))
+    else:
+        breakpoint = target.BreakpointCreateByName(location)
+    if not breakpoint.IsValid():
+        raise RuntimeError(f"Failed to create a breakpoint at {location}")
+
+    list_traces[breakpoint.GetID()] = {
+        'name': f"{variable_name}@{location}",
+        'variable_name': variable_name,
+        'expressions': expressions,
+        'max_hits': max_hits,
+        'hits': 0,
+        'failures': 0,  # consecutive failed hits
+        'error_count': 0,
+        'hit_numbers': [],
+        'sizes': [],
+        # one entry per hit: a numpy array for numeric expressions, a list of strings otherwise
+        'columns': {expr: [] for expr in expressions},
+        'errors': [],
+    }
+    breakpoint.SetScriptCallbackFunction(f"{__name__}.list_trace_callback")
+    return f"Tracing {variable_name} at {location} (breakpoint {breakpoint.GetID()})"
+
+def list_trace_callback(frame, bp_loc, internal_dict):
+    breakpoint = bp_loc.GetBreakpoint()
+    trace = list_traces.get(breakpoint.GetID())
+    if trace is None:
+        return True
+
+    target = frame.GetThread().GetProcess().GetTarget()
+    variable_name = trace['variable_name']
+    hit_number = trace['hits']
+    trace['hits'] += 1
+    try:
+        size_value = frame.EvaluateExpression(f"{variable_name}.size()")
+        if not size_value.GetError().Success():
+            raise RuntimeError(f"Failed to evaluate {variable_name}.size(): " + str(size_value.GetError().GetCString()))
+        size = size_value.GetValueAsUnsigned()
+        hit_columns = []
+        for expr in trace['expressions']:
+            # per-element evaluation would be far too slow to run at every hit, errors are logged instead
+            vals, typed_vals = get_expression_values_for_list(target, frame, variable_name, expr, typed_only=True, list_size=size, fallback=False)
+            hit_columns.append(typed_vals if typed_vals is not None else vals)
+    except Exception as e:
+        trace['error_count'] += 1
+        trace['failures'] += 1
+        if len(trace['errors']) < list_trace_max_errors:
+            trace['errors'].append((hit_number, str(e)))
+    else:
+        # the log stays columnar: every column has exactly one entry per recorded hit
+        trace['failures'] = 0
+        trace['hit_numbers'].append(hit_number)
+        trace['sizes'].append(size)
+        for expr, hit_values in zip(trace['expressions'], hit_columns):
+            trace['columns'][expr].append(hit_values)
+
+    # every hit counts towards max_hits, and a trace that keeps failing (e.g. the variable is out of scope) stops
+    if (trace['max_hits'] is not None and trace['hits'] >= trace['max_hits']) or trace['failures'] >= list_trace_max_failures:
+        breakpoint.SetEnabled(False)
+        list_trace_vis(breakpoint.GetID())
+        return True
+    # returning False continues the process without a stop event, so the UI is not refreshed
+    return False
+
+def get_trace_plot(trace, expr):
+    """Returns an <img> tag plotting a numeric trace column, or None if the column is not numeric"""
+    import numpy as np
+
+    hits = trace['columns'][expr]
+    if not hits or not all(isinstance(hit_values, np.ndarray) for hit_values in hits):
+        return None
+
+    hit_numbers = trace['hit_numbers']
+    figure = plt.figure(figsize=(8, 4))
+    if len(set(len(hit_values) for hit_values in hits)) == 1 and len(hits[0]) > 1:
+        # same size at every hit: one row per hit, strided so the matrix stays at most list_trace_plot_size squared
+        row_step = -(-len(hits) // list_trace_plot_size)
+        column_step = -(-len(hits[0]) // list_trace_plot_size)
+        matrix = np.stack([hit_values[::column_step] for hit_values in hits[::row_step]]).astype(np.float64)
+        extent = (0, len(hits[0]), hit_numbers[-1] + 0.5, hit_numbers[0] - 0.5)
+        plt.imshow(matrix, aspect='auto', interpolation='nearest', extent=extent)
+        plt.colorbar()
+        plt.xlabel('element')
+        plt.ylabel('hit')
+    else:
+        non_empty = [(hit_numbers[i], hit_values) for i, hit_values in enumerate(hits) if len(hit_values) > 0]
+        x = [i for i, _ in non_empty]
+        plt.plot(x, [hit_values.min() for _, hit_values in non_empty], label='min')
+        plt.plot(x, [hit_values.mean() for _, hit_values in non_empty], label='mean')
+        plt.plot(x, [hit_values.max() for _, hit_values in non_empty], label='max')
+        plt.legend()
+        plt.xlabel('hit')
+    plt.title(expr)
+
+    image_bytes = io.BytesIO()
+    plt.savefig(image_bytes, format='png')
+    plt.close(figure)
+    return '<img src="data:image/png;base64,%s">' % base64.b64encode(image_bytes.getvalue()).decode('utf-8')
+
+def list_trace_vis(breakpoint_id=None):
+    """Renders the series collected by list_trace (all traces if breakpoint_id is None)"""
+    import html
+    import numpy as np
+
+    if breakpoint_id is not None and breakpoint_id not in list_traces:
+        return f"No list_trace for breakpoint {breakpoint_id}"
+    trace_ids = list(list_traces.keys()) if breakpoint_id is None else [breakpoint_id]
+    for trace_id in trace_ids:
+        trace = list_traces[trace_id]
+        document = f"<html><body style=\"font-family: monospace;\"><h3>{html.escape(trace['name'])}: {trace['hits']} hits, {len(trace['sizes'])} recorded</h3>"
+
+        for expr in trace['expressions']:
+            plot = get_trace_plot(trace, expr)
+            if plot is not None:
+                document += f"<div>{plot}</div>"
+
+        # table with one row per hit, showing the first values of each column
+        document += "<table border=\"1\" style=\"border-collapse: collapse;\"><tr><th>hit</th><th>size</th>"
+        document += "".join(f"<th>{html.escape(expr)}</th>" for expr in trace['expressions'])
+        document += "</tr>"
+        for position, (hit, size) in enumerate(zip(trace['hit_numbers'], trace['sizes'])):
+            document += f"<tr><td>{hit}</td><td>{size}</td>"
+            for expr in trace['expressions']:
+                hit_values = trace['columns'][expr][position]
+                preview = hit_values[:10].tolist() if isinstance(hit_values, np.ndarray) else hit_values[:10]
+                suffix = ", ..." if len(hit_values) > 10 else ""
+                document += f"<td>{html.escape(', '.join(str(v) for v in preview) + suffix)}</td>"
+            document += "</tr>"
+        document += "</table>"
+
+        for hit, error in trace['errors']:
+            document += f"<div>error at hit {hit}: {html.escape(error)}</div>"
+        if trace['error_count'] > len(trace['errors']):
+            document += f"<div>... {trace['error_count'] - len(trace['errors'])} more errors</div>"
+        if trace['failures'] >= list_trace_max_failures:
+            document += f"<div>stopped after {trace['failures']} failed hits in a row</div>"
+        document += "</body></html>"
+
+        webview_name = f"trace@{trace_id}"
+        if webview_name in value_to_webview_map:
+            value_to_webview_map[webview_name].set_html(document)
+        else:
+            value_to_webview_map[webview_name] = debugger.create_webview(document, view_column=2)
+
+    return f"Rendered {len(trace_ids)} traces"
+
+def list_trace_stop(breakpoint_id):
+    """Removes the breakpoint of a list_trace and renders what was collected"""
+    if breakpoint_id not in list_traces:
+        return f"No list_trace for breakpoint {breakpoint_id}"
+    target = lldb.debugger.GetSelectedTarget()
+    result = list_trace_vis(breakpoint_id)
+    target.BreakpointDelete(breakpoint_id)
+    del list_traces[breakpoint_id]
+    return result